@@ -1,20 +1,29 @@
-from flask import Flask
+from flask import Flask, Blueprint
 from flask_cors import CORS
 from config import config
 
 def create_app(config_name='default'):
+    from app.utils.helpers import OrjsonProvider
+    
     app = Flask(__name__)
+    # Decode request bodies with orjson instead of the stdlib json module
+    app.json = OrjsonProvider(app)
     CORS(app)
     
     app.config.from_object(config[config_name])
+    # Match with or without a trailing slash instead of redirecting
+    app.url_map.strict_slashes = False
     
     # Register blueprints
     from app.routes.pattern_routes import pattern_bp
     from app.routes.behavior_routes import behavior_bp
     from app.routes.combined_analysis_routes import combined_bp
     
-    app.register_blueprint(pattern_bp, url_prefix='/api/v1/analyze')
-    app.register_blueprint(behavior_bp, url_prefix='/api/v1/analyze')
-    app.register_blueprint(combined_bp, url_prefix='/api/v1/analyze')
+    # All analysis endpoints share one prefix, declared once on a parent blueprint
+    analyze_bp = Blueprint('analyze', __name__, url_prefix='/api/v1/analyze')
+    analyze_bp.register_blueprint(pattern_bp)
+    analyze_bp.register_blueprint(behavior_bp)
+    analyze_bp.register_blueprint(combined_bp)
+    app.register_blueprint(analyze_bp)
     
     return app
@@ -1,5 +1,8 @@
 from marshmallow import Schema, fields, pre_load
 from datetime import datetime
+from typing import Annotated, Optional
+import sys
+import msgspec
 
 class TradeSchema(Schema):
     accountId = fields.Int(required=True)
@@ -21,4 +24,27 @@ class TradeSchema(Schema):
     def process_date(self, data, **kwargs):
         if isinstance(data.get('date'), datetime):
             data['date'] = data['date'].isoformat()
-        return data
\ No newline at end of file
+        return data
+
+# Bounded to the finite doubles, so nan and infinity (also as "nan"/"inf" strings)
+# are rejected during conversion, as TradeSchema's Float fields reject them
+FiniteFloat = Annotated[float, msgspec.Meta(ge=-sys.float_info.max, le=sys.float_info.max)]
+
+class Trade(msgspec.Struct, kw_only=True, forbid_unknown_fields=True):
+    """msgspec mirror of TradeSchema, used to validate request payloads"""
+    accountId: int
+    pair: str
+    direction: str
+    status: str
+    strategy: Optional[str] = None
+    # Kept as a string and checked with Marshmallow's ISO 8601 parser, so numeric
+    # timestamps are rejected and the accepted formats match TradeSchema
+    date: str
+    accountBalance: FiniteFloat
+    entryPrice: FiniteFloat
+    size: FiniteFloat
+    stopLoss: FiniteFloat
+    target: FiniteFloat
+    exitPrice: FiniteFloat
+    netPNL: FiniteFloat
+    accountChange: FiniteFloat
@@ -1,8 +1,7 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request
 from app.services.behavior_analyzer import BehaviorAnalyzer
-from app.models.trade import TradeSchema
 from app.utils.validators import validate_trades
-import numpy as np
+from app.utils.helpers import json_response
 
 behavior_bp = Blueprint('behavior', __name__)
 
@@ -20,24 +19,7 @@ def analyze_behavior():
     
     insights = analyzer.get_behavior_insights()
     
-    # Convert numpy types to Python native types
-    def convert_to_native(obj):
-        if isinstance(obj, np.integer):
-            return int(obj)
-        elif isinstance(obj, np.floating):
-            return float(obj)
-        elif isinstance(obj, np.ndarray):
-            return obj.tolist()
-        elif isinstance(obj, dict):
-            return {key: convert_to_native(value) for key, value in obj.items()}
-        elif isinstance(obj, list):
-            return [convert_to_native(item) for item in obj]
-        else:
-            return obj
-
-    analysis = convert_to_native(analysis)
-    
-    return jsonify({
+    return json_response({
         'analysis': analysis,
         'insights': insights
     })
@@ -2,7 +2,7 @@ from flask import Blueprint, request, jsonify
 from app.services.pattern_analyzer import PatternAnalyzer
 from app.services.behavior_analyzer import BehaviorAnalyzer
 from app.utils.validators import validate_trades
-import numpy as np
+from app.utils.helpers import calculate_trade_metrics, json_response
 
 combined_bp = Blueprint('combined', __name__)
 
@@ -10,8 +10,11 @@ combined_bp = Blueprint('combined', __name__)
 @validate_trades
 def combined_analysis():
     trades = request.json
-    pattern_analyzer = PatternAnalyzer(trades)
-    behavior_analyzer = BehaviorAnalyzer(trades)
+    # Build the DataFrame once; the behavior analyzer gets a shallow copy so
+    # columns either analyzer adds stay local to it
+    trades_df = calculate_trade_metrics(trades)
+    pattern_analyzer = PatternAnalyzer(trades_df=trades_df)
+    behavior_analyzer = BehaviorAnalyzer(trades_df=trades_df.copy(deep=False))
     
     try:
         pattern_analysis = {
@@ -32,27 +35,9 @@ def combined_analysis():
         behavior_insights = behavior_analyzer.get_behavior_insights()
         key_insights = behavior_analyzer.get_key_insights()
         
-        # Convert numpy types to Python native types
-        def convert_to_native(obj):
-            if isinstance(obj, np.integer):
-                return int(obj)
-            elif isinstance(obj, np.floating):
-                return float(obj)
-            elif isinstance(obj, np.ndarray):
-                return obj.tolist()
-            elif isinstance(obj, dict):
-                return {key: convert_to_native(value) for key, value in obj.items()}
-            elif isinstance(obj, list):
-                return [convert_to_native(item) for item in obj]
-            else:
-                return obj
-
-        pattern_analysis = convert_to_native(pattern_analysis)
-        behavior_analysis = convert_to_native(behavior_analysis)
-        
         key_trading_insights = pattern_analyzer.get_key_trading_insights()
         
-        return jsonify({
+        return json_response({
             'pattern_analysis': pattern_analysis,
             'pattern_insights': pattern_insights,
             'behavior_analysis': behavior_analysis,
@@ -1,80 +1,193 @@
+from collections import namedtuple
 import pandas as pd
+from pandas.api.types import is_datetime64_any_dtype
 import numpy as np
-from typing import List, Dict, Any
-from app.utils.helpers import calculate_trade_metrics
+from typing import List, Dict, Any, Optional
+from app.utils.helpers import calculate_trade_metrics, memoize_method
+from app.utils._njit import njit
+
+# Trades opened within this many nanoseconds after a loss count as revenge trades
+REVENGE_WINDOW_NS = 30 * 60 * 10**9
+
+# Aggregates produced by _trade_scan in a single pass over the trades
+TradeScan = namedtuple('TradeScan', [
+    'win_rate', 'total_pnl', 'loss_recovery_rate', 'max_drawdown', 'sharpe_ratio',
+    'revenge_count', 'revenge_success_rate', 'revenge_avg_pnl'
+])
+
+@njit(cache=True)
+def _trade_scan(dates_ns, is_win, is_loss, pnl, bal, change):
+    """Walk date-sorted trades once, collecting every per-trade behavior aggregate"""
+    n = len(pnl)
+    wins = 0
+    total_pnl = 0.0
+    # Runs of consecutive non-winning trades
+    streaks = 0
+    streak_trades = 0
+    # Drawdown from the running balance peak
+    peak = bal[0]
+    max_drawdown = 0.0
+    # Trades opened within the revenge window after a loss
+    revenge_count = 0
+    revenge_wins = 0
+    revenge_pnl = 0.0
+    # Welford's running mean/variance of accountChange
+    change_mean = 0.0
+    change_m2 = 0.0
+    
+    for i in range(n):
+        total_pnl += pnl[i]
+        if is_win[i]:
+            wins += 1
+        else:
+            streak_trades += 1
+            if i == 0 or is_win[i - 1]:
+                streaks += 1
+        
+        peak = max(peak, bal[i])
+        max_drawdown = max(max_drawdown, peak - bal[i])
+        
+        if i + 1 < n and is_loss[i] and dates_ns[i + 1] - dates_ns[i] < REVENGE_WINDOW_NS:
+            revenge_count += 1
+            if is_win[i + 1]:
+                revenge_wins += 1
+            revenge_pnl += pnl[i + 1]
+        
+        delta = change[i] - change_mean
+        change_mean += delta / (i + 1)
+        change_m2 += delta * (change[i] - change_mean)
+    
+    loss_recovery_rate = streak_trades / streaks if streaks > 0 else np.nan
+    revenge_success_rate = revenge_wins / revenge_count if revenge_count > 0 else np.nan
+    revenge_avg_pnl = revenge_pnl / revenge_count if revenge_count > 0 else np.nan
+    
+    # Sharpe ratio, assuming 252 trading days in a year; a zero std gives +/-inf like pandas
+    sharpe_ratio = np.nan
+    if n > 1:
+        change_std = np.sqrt(change_m2 / (n - 1))
+        if change_std > 0:
+            sharpe_ratio = change_mean / change_std * np.sqrt(252.0)
+        elif change_mean != 0:
+            sharpe_ratio = np.inf if change_mean > 0 else -np.inf
+    
+    # Relative to the starting balance; a zero start gives inf (NaN with no drop) like pandas
+    if bal[0] != 0:
+        relative_drawdown = max_drawdown / bal[0]
+    else:
+        relative_drawdown = np.inf if max_drawdown > 0 else np.nan
+    
+    return TradeScan(
+        wins / n, total_pnl, loss_recovery_rate, relative_drawdown, sharpe_ratio,
+        revenge_count, revenge_success_rate, revenge_avg_pnl
+    )
+
+def _sample_std(values: np.ndarray) -> float:
+    """Sample standard deviation (ddof=1, like pandas), NaN for fewer than two values"""
+    return values.std(ddof=1) if len(values) > 1 else np.nan
 
 class BehaviorAnalyzer:
-    def __init__(self, trades: List[Dict[Any, Any]]):
-        self.trades_df = calculate_trade_metrics(trades)
+    def __init__(self, trades: Optional[List[Dict[Any, Any]]] = None, trades_df: Optional[pd.DataFrame] = None):
+        # Reuse a DataFrame already built by calculate_trade_metrics when given
+        self.trades_df = trades_df if trades_df is not None else calculate_trade_metrics(trades)
+        # Results of @memoize_method analyses, keyed by method name
+        self._cache = {}
+        
+        # Columns the analyses reuse, pulled out once as plain ndarrays
+        df = self.trades_df
+        self._status = df['status'].values
+        self._is_win = self._status == 'win'
+        self._is_loss = self._status == 'loss'
+        self._pnl = df['netPNL'].to_numpy(dtype=np.float64)
+        self._size = df['size'].to_numpy(dtype=np.float64)
+        self._entry = df['entryPrice'].to_numpy(dtype=np.float64)
+        self._sl = df['stopLoss'].to_numpy(dtype=np.float64)
+        self._bal = df['accountBalance'].to_numpy(dtype=np.float64)
+        dates = df['date']
+        if not is_datetime64_any_dtype(dates):
+            # Mixed UTC offsets leave an object column; time trades by their UTC instants
+            dates = pd.to_datetime(dates, utc=True)
+        
+        # Everything that is a scan over the sorted trades, computed in one compiled pass
+        self._scan = _trade_scan(
+            dates.values.view('i8'),
+            self._is_win,
+            self._is_loss,
+            self._pnl,
+            self._bal,
+            df['accountChange'].to_numpy(dtype=np.float64)
+        )
     
+    @memoize_method
     def detect_overtrading(self) -> Dict:
         """Detect potential overtrading patterns"""
-        trades_per_day = self.trades_df.groupby(self.trades_df['date'].dt.date).size()
+        # Bucket by the trades' own wall-clock day, as .dt.date would
+        dates = self.trades_df['date']
+        if not is_datetime64_any_dtype(dates):
+            # Mixed UTC offsets: an object column of Timestamps
+            dates = pd.to_datetime(dates.map(lambda date: date.tz_localize(None)))
+        elif dates.dt.tz is not None:
+            dates = dates.dt.tz_localize(None)
+        _, trades_per_day = np.unique(dates.values.astype('datetime64[D]'), return_counts=True)
+        mean = trades_per_day.mean()
+        std = _sample_std(trades_per_day)
+        frequencies, frequency_counts = np.unique(trades_per_day, return_counts=True)
         
         return {
-            'avg_trades_per_day': trades_per_day.mean(),
+            'avg_trades_per_day': mean,
             'max_trades_per_day': trades_per_day.max(),
-            'days_with_excessive_trading': len(trades_per_day[trades_per_day > trades_per_day.mean() + trades_per_day.std()]),
-            'trading_frequency_distribution': trades_per_day.value_counts().to_dict()
+            'days_with_excessive_trading': int((trades_per_day > mean + std).sum()),
+            'trading_frequency_distribution': dict(zip(frequencies.tolist(), frequency_counts.tolist()))
         }
     
+    @memoize_method
     def detect_revenge_trading(self) -> Dict:
         """Detect potential revenge trading patterns"""
-        self.trades_df['time_to_next_trade'] = self.trades_df['date'].shift(-1) - self.trades_df['date']
-        
-        quick_trades_after_loss = self.trades_df[
-            (self.trades_df['status'] == 'loss') & 
-            (self.trades_df['time_to_next_trade'] < pd.Timedelta(minutes=30))
-        ]
-        
         return {
-            'quick_trades_after_losses': len(quick_trades_after_loss),
-            'quick_trades_after_losses_success_rate': (quick_trades_after_loss['status'].shift(-1) == 'win').mean(),
-            'avg_pnl_after_quick_trade': quick_trades_after_loss['netPNL'].shift(-1).mean()
+            'quick_trades_after_losses': self._scan.revenge_count,
+            'quick_trades_after_losses_success_rate': self._scan.revenge_success_rate,
+            'avg_pnl_after_quick_trade': self._scan.revenge_avg_pnl
         }
     
+    @memoize_method
     def analyze_risk_management_consistency(self) -> Dict:
         """Analyze consistency in risk management"""
         return {
-            'position_size_consistency': self.trades_df['size'].std() / self.trades_df['size'].mean(),
-            'stop_loss_consistency': (
-                (self.trades_df['stopLoss'] - self.trades_df['entryPrice']).abs() / 
-                self.trades_df['entryPrice']
-            ).std(),
-            'risk_per_trade_consistency': (
-                self.trades_df['netPNL'].abs() / self.trades_df['accountBalance']
-            ).std()
+            'position_size_consistency': _sample_std(self._size) / self._size.mean(),
+            'stop_loss_consistency': _sample_std(np.abs(self._sl - self._entry) / self._entry),
+            'risk_per_trade_consistency': _sample_std(np.abs(self._pnl) / self._bal)
         }
     
     def get_behavior_insights(self) -> List[str]:
-        insights = []
-        
-        # Overtrading insights
+        # Pull every metric up front as plain Python scalars; formatting numpy
+        # scalars goes through their slower __format__
         overtrading = self.detect_overtrading()
-        avg_trades = overtrading['avg_trades_per_day']
-        max_trades = overtrading['max_trades_per_day']
+        avg_trades = float(overtrading['avg_trades_per_day'])
+        max_trades = int(overtrading['max_trades_per_day'])
         excessive_days = overtrading['days_with_excessive_trading']
         
+        revenge = self.detect_revenge_trading()
+        quick_losses = revenge['quick_trades_after_losses']
+        success_rate = float(revenge['quick_trades_after_losses_success_rate'])
+        avg_pnl = float(revenge['avg_pnl_after_quick_trade'])
+        
+        risk = self.analyze_risk_management_consistency()
+        position_consistency = risk['position_size_consistency']
+        stop_loss_consistency = risk['stop_loss_consistency']
+        risk_per_trade = risk['risk_per_trade_consistency']
+        
+        insights = []
+        
+        # Overtrading insights
         insights.append(f"On average, you make {avg_trades:.2f} trades per day, with a maximum of {max_trades} trades in a single day.")
         if excessive_days > 0:
             insights.append(f"There were {excessive_days} days with excessive trading, which might indicate overtrading tendencies.")
         
         # Revenge trading insights
-        revenge = self.detect_revenge_trading()
-        quick_losses = revenge['quick_trades_after_losses']
-        success_rate = revenge['quick_trades_after_losses_success_rate']
-        avg_pnl = revenge['avg_pnl_after_quick_trade']
-        
         if quick_losses > 0:
             insights.append(f"You made {quick_losses} quick trades after losses, which could be signs of revenge trading.")
             insights.append(f"The success rate of these quick trades is {success_rate:.2%}, with an average PNL of {avg_pnl:.2f}.")
         
         # Risk management consistency insights
-        risk = self.analyze_risk_management_consistency()
-        position_consistency = risk['position_size_consistency']
-        stop_loss_consistency = risk['stop_loss_consistency']
-        risk_per_trade = risk['risk_per_trade_consistency']
-        
         if position_consistency > 0.5:
             insights.append("Your position sizes vary considerably, which might indicate inconsistent risk management.")
         else:
@@ -94,20 +207,21 @@ class BehaviorAnalyzer:
     
     def calculate_loss_recovery_rate(self) -> float:
         """Calculate the average number of trades needed to recover from a loss"""
-        loss_streaks = (self.trades_df['status'] != 'win').astype(int).groupby(
-            (self.trades_df['status'] == 'win').astype(int).cumsum()
-        ).sum()
-        return loss_streaks[loss_streaks > 0].mean()
+        return self._scan.loss_recovery_rate
 
     def calculate_sharpe_ratio(self) -> float:
         """Calculate the Sharpe ratio"""
-        returns = self.trades_df['accountChange']
-        return (returns.mean() / returns.std()) * np.sqrt(252)  # Assuming 252 trading days in a year
+        return self._scan.sharpe_ratio
+
+    def calculate_max_drawdown(self) -> float:
+        """Largest drop from a running balance peak, relative to the starting balance"""
+        return self._scan.max_drawdown
 
+    @memoize_method
     def determine_risk_level(self) -> str:
         """Determine the risk level based on various factors"""
         sharpe_ratio = self.calculate_sharpe_ratio()
-        max_drawdown = (self.trades_df['accountBalance'].cummax() - self.trades_df['accountBalance']).max() / self.trades_df['accountBalance'].iloc[0]
+        max_drawdown = self.calculate_max_drawdown()
         
         if sharpe_ratio > 1.5 and max_drawdown < 0.1:
             return "Low"
@@ -119,8 +233,8 @@ class BehaviorAnalyzer:
     def get_key_insights(self) -> str:
         """Generate a key insight about overall performance"""
         total_trades = len(self.trades_df)
-        win_rate = (self.trades_df['status'] == 'win').mean()
-        total_pnl = self.trades_df['netPNL'].sum()
+        win_rate = self._scan.win_rate
+        total_pnl = self._scan.total_pnl
         sharpe_ratio = self.calculate_sharpe_ratio()
         risk_level = self.determine_risk_level()
         
@@ -1,94 +1,165 @@
 import pandas as pd
 import numpy as np
-from typing import List, Dict, Any, Union
-from app.utils.helpers import calculate_trade_metrics
+from typing import List, Dict, Any, Union, Optional
+from app.utils.helpers import calculate_trade_metrics, memoize_method
+
+SIZE_LABELS = ['Small', 'Medium', 'Large', 'Very Large']
+
+def _quantile_bins(values: np.ndarray, q: int):
+    """Right-closed quantile bins like pd.qcut(..., duplicates='drop'): (bin ids, edges)"""
+    ordered = np.sort(values)
+    # Positions worked out step for step as pd.qcut's call to np.percentile does
+    quantiles = np.linspace(0, 1, q + 1) * 100.0 / 100
+    position = len(ordered) * quantiles + (1 - quantiles) - 1
+    low = np.floor(position).astype(np.int64)
+    lower, upper = ordered[low], ordered[np.ceil(position).astype(np.int64)]
+    fraction = position - low
+    with np.errstate(invalid='ignore'):
+        from_lower = lower + (upper - lower) * fraction
+        from_upper = upper - (upper - lower) * (1 - fraction)
+    # Same interpolation as numpy, except that an infinite value (stop
+    # loss at the entry price) gives an infinite edge rather than NaN
+    interpolated = np.where((fraction < 0.5) | np.isnan(from_upper), from_lower, from_upper)
+    edges = np.unique(np.where(lower == upper, lower, interpolated))
+    if len(edges) == 1:
+        # All values equal: keep them together in a single bin
+        edges = np.repeat(edges, 2)
+    # The lowest edge is included in the first bin
+    bins = np.maximum(np.searchsorted(edges, values, side='left') - 1, 0)
+    return bins, edges
+
+def _round_frac(x: float, precision: int) -> float:
+    """Round to `precision` significant fractional digits, as pd.qcut labels its bins"""
+    if not np.isfinite(x) or x == 0:
+        return x
+    frac, whole = np.modf(x)
+    digits = -int(np.floor(np.log10(abs(frac)))) - 1 + precision if whole == 0 else precision
+    return np.around(x, digits)
+
+def _label_edges(edges: np.ndarray, precision: int = 3) -> List[float]:
+    """Bin edges as pd.qcut displays them, so range keys stay the same"""
+    for p in range(precision, 20):
+        if len(set(_round_frac(e, p) for e in edges)) == len(edges):
+            precision = p
+            break
+    breaks = [_round_frac(e, precision) for e in edges]
+    # The first bin includes its lower edge, shown by lowering it one step
+    breaks[0] = breaks[0] - 10 ** (-precision)
+    return breaks
+
+def _binned_mean_std(bins: np.ndarray, counts: np.ndarray, values: np.ndarray):
+    """Per-bin mean and sample std (NaN for bins with fewer than two values)"""
+    nbins = len(counts)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = np.bincount(bins, weights=values, minlength=nbins) / counts
+        deviation = values - mean[bins]
+        variance = np.bincount(bins, weights=deviation * deviation, minlength=nbins) / (counts - 1)
+    std = np.where(counts > 1, np.sqrt(np.maximum(variance, 0)), np.nan)
+    return mean, std
 
 class PatternAnalyzer:
-    def __init__(self, trades: Union[List[Dict[Any, Any]], Dict[Any, Any]]):
-        # Convert single trade to list if necessary
-        trades_list = [trades] if isinstance(trades, dict) else trades
-        self.trades_df = calculate_trade_metrics(trades_list)
+    def __init__(self, trades: Optional[Union[List[Dict[Any, Any]], Dict[Any, Any]]] = None, trades_df: Optional[pd.DataFrame] = None):
+        # Reuse a DataFrame already built by calculate_trade_metrics when given
+        if trades_df is not None:
+            self.trades_df = trades_df
+        else:
+            # Convert single trade to list if necessary
+            trades_list = [trades] if isinstance(trades, dict) else trades
+            self.trades_df = calculate_trade_metrics(trades_list)
+        # Results of @memoize_method analyses, keyed by method name
+        self._cache = {}
+        
+        # Columns the analyses reuse, pulled out once as plain ndarrays
+        df = self.trades_df
+        self._is_win = (df['status'].values == 'win').astype(np.float64)
+        self._pnl = df['netPNL'].to_numpy(dtype=np.float64)
+        self._account_change = df['accountChange'].to_numpy(dtype=np.float64)
     
+    @memoize_method
     def analyze_position_size_impact(self) -> Dict:
         """Analyze how position size affects win rate"""
-        if len(self.trades_df) < 4:
-            # Handle small number of trades
-            size_groups = pd.qcut(self.trades_df['size'], 
-                                min(len(self.trades_df), 4), 
-                                labels=['Small', 'Medium', 'Large', 'Very Large'][:len(self.trades_df)],
-                                duplicates='drop')
-        else:
-            size_groups = pd.qcut(self.trades_df['size'], 4, 
-                                labels=['Small', 'Medium', 'Large', 'Very Large'])
-            
-        self.trades_df['size_quartile'] = size_groups
-        
-        size_analysis = self.trades_df.groupby('size_quartile', observed=True).agg({
-            'status': lambda x: (x == 'win').mean(),
-            'netPNL': ['mean', 'std'],
-            'accountChange': ['mean', 'std']
-        }).round(4)
-        
-        # Convert the multi-index DataFrame to a nested dictionary with string keys
+        # Fewer trades than quartiles: use one group per trade at most
+        bins, edges = _quantile_bins(self.trades_df['size'].to_numpy(dtype=np.float64), min(len(self.trades_df), 4))
+        counts = np.bincount(bins, minlength=len(edges) - 1)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            win_rate = np.bincount(bins, weights=self._is_win, minlength=len(counts)) / counts
+        pnl_mean, pnl_std = _binned_mean_std(bins, counts, self._pnl)
+        change_mean, change_std = _binned_mean_std(bins, counts, self._account_change)
+        
         result = {}
-        for size_group in size_analysis.index:
-            result[str(size_group)] = {
-                'win_rate': float(size_analysis.loc[size_group, 'status']),
+        for i, size_group in enumerate(SIZE_LABELS[:len(counts)]):
+            if counts[i] == 0:
+                continue
+            result[size_group] = {
+                'win_rate': float(np.round(win_rate[i], 4)),
                 'netPNL': {
-                    'mean': float(size_analysis.loc[size_group, ('netPNL', 'mean')]),
-                    'std': float(size_analysis.loc[size_group, ('netPNL', 'std')])
+                    'mean': float(np.round(pnl_mean[i], 4)),
+                    'std': float(np.round(pnl_std[i], 4))
                 },
                 'accountChange': {
-                    'mean': float(size_analysis.loc[size_group, ('accountChange', 'mean')]),
-                    'std': float(size_analysis.loc[size_group, ('accountChange', 'std')])
+                    'mean': float(np.round(change_mean[i], 4)),
+                    'std': float(np.round(change_std[i], 4))
                 }
             }
         
         return result
     
+    @memoize_method
     def analyze_pair_direction_bias(self) -> Dict:
         """Analyze win rates and profitability by direction for each pair"""
-        direction_analysis = self.trades_df.groupby(['pair', 'direction']).agg({
-            'status': lambda x: (x == 'win').mean(),
-            'netPNL': 'mean',
-            'accountChange': 'mean'
-        }).round(4)
+        # Encode (pair, direction) as one sorted integer key so groups come out in groupby order
+        pair_codes, pairs = pd.factorize(self.trades_df['pair'].values, sort=True)
+        direction_codes, directions = pd.factorize(self.trades_df['direction'].values, sort=True)
+        keys = pair_codes * len(directions) + direction_codes
+        nkeys = len(pairs) * len(directions)
+        
+        counts = np.bincount(keys, minlength=nkeys)
+        present = np.flatnonzero(counts)
+        counts = counts[present]
+        win_rate = np.round(np.bincount(keys, weights=self._is_win, minlength=nkeys)[present] / counts, 4)
+        avg_pnl = np.round(np.bincount(keys, weights=self._pnl, minlength=nkeys)[present] / counts, 4)
+        avg_change = np.round(np.bincount(keys, weights=self._account_change, minlength=nkeys)[present] / counts, 4)
         
-        # Convert the multi-index DataFrame to a nested dictionary with string keys
         result = {}
-        for (pair, direction), row in direction_analysis.iterrows():
+        for i, key in enumerate(present):
+            pair, direction = pairs[key // len(directions)], directions[key % len(directions)]
             if pair not in result:
                 result[pair] = {}
             result[pair][direction] = {
-                'win_rate': float(row['status']),
-                'avg_netPNL': float(row['netPNL']),
-                'avg_accountChange': float(row['accountChange'])
+                'win_rate': float(win_rate[i]),
+                'avg_netPNL': float(avg_pnl[i]),
+                'avg_accountChange': float(avg_change[i])
             }
         
         return result
     
+    @memoize_method
     def analyze_risk_reward_patterns(self) -> Dict:
         """Analyze risk/reward ratio effectiveness"""
-        if len(self.trades_df) < 4:
-            # For small number of trades, use fewer groups
-            rr_groups = pd.qcut(self.trades_df['rr_ratio'], 
-                              min(len(self.trades_df), 4), 
-                              duplicates='drop')
-        else:
-            rr_groups = pd.qcut(self.trades_df['rr_ratio'], 4)
-            
-        rr_analysis = self.trades_df.groupby(rr_groups).agg({
-            'status': lambda x: (x == 'win').mean(),
-            'netPNL': 'mean'
-        }).round(4)
-        
-        # Convert the index to strings and then to a dictionary
+        rr_ratio = self.trades_df['rr_ratio'].to_numpy(dtype=np.float64)
+        # No ratio when stop loss, entry and target coincide; pd.qcut left these out
+        valid = ~np.isnan(rr_ratio)
+        if not valid.any():
+            return {}
+        
+        # Fewer trades than quartiles: use one group per trade at most, counting
+        # trades without a ratio as pd.qcut did
+        bins, edges = _quantile_bins(rr_ratio[valid], min(len(rr_ratio), 4))
+        counts = np.bincount(bins, minlength=len(edges) - 1)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            win_rate = np.bincount(bins, weights=self._is_win[valid], minlength=len(counts)) / counts
+            avg_pnl = np.bincount(bins, weights=self._pnl[valid], minlength=len(counts)) / counts
+        
+        # Key each range by its quantile edges; empty ranges are kept with NaN stats
+        labels = _label_edges(edges)
         result = {}
-        for rr_range, row in rr_analysis.iterrows():
-            key = f"{rr_range.left:.2f}-{rr_range.right:.2f}"
+        for i in range(len(counts)):
+            key = f"{labels[i]:.2f}-{labels[i + 1]:.2f}"
             result[key] = {
-                'win_rate': float(row['status']),  # Convert to float
-                'avg_netPNL': float(row['netPNL'])  # Convert to float
+                'win_rate': float(np.round(win_rate[i], 4)),
+                'avg_netPNL': float(np.round(avg_pnl[i], 4))
             }
         
         return result
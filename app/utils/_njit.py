@@ -0,0 +1,9 @@
+"""numba.njit when numba is installed, otherwise a no-op decorator"""
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        # Support both bare @njit and @njit(cache=True)
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
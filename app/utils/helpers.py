@@ -1,11 +1,65 @@
-from typing import List, Dict
+from functools import wraps
+from typing import List, Dict, Any
+from flask import current_app
+from flask.json.provider import DefaultJSONProvider
+import orjson
+import numpy as np
 import pandas as pd
+from pandas.api.types import is_datetime64_any_dtype
+
+# numpy scalars/arrays are encoded natively. OPT_SORT_KEYS sorts after non-str keys are
+# converted to strings, so integer keys (e.g. trading_frequency_distribution) come out
+# lexicographically ("1", "10", "2"), not numerically as jsonify orders them
+_ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS | orjson.OPT_SORT_KEYS
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider that decodes request bodies (request.json) with orjson"""
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+def json_response(payload: Any, status: int = 200):
+    """Serialize payload (numpy values included) straight to a JSON response"""
+    return current_app.response_class(
+        orjson.dumps(payload, option=_ORJSON_OPTIONS),
+        status=status,
+        mimetype='application/json'
+    )
+
+def memoize_method(method):
+    """Cache a no-argument analyzer method's result in the instance's _cache dict"""
+    @wraps(method)
+    def wrapper(self):
+        if method.__name__ not in self._cache:
+            self._cache[method.__name__] = method(self)
+        return self._cache[method.__name__]
+    return wrapper
 
 def calculate_trade_metrics(trades: List[Dict]) -> pd.DataFrame:
     """Convert trades list to DataFrame and calculate basic metrics"""
     df = pd.DataFrame(trades)
-    df['date'] = pd.to_datetime(df['date'])
-    df['risk'] = abs(df['entryPrice'] - df['stopLoss'])
-    df['reward'] = abs(df['target'] - df['entryPrice'])
-    df['rr_ratio'] = df['reward'] / df['risk']
-    return df.sort_values('date')
\ No newline at end of file
+    # Validated dates are ISO 8601, so skip per-element format inference
+    df['date'] = pd.to_datetime(df['date'], format='ISO8601', cache=True)
+    # The columns are aligned, so work on the raw arrays rather than through Series arithmetic
+    entry = df['entryPrice'].to_numpy(dtype=np.float64)
+    risk = np.abs(entry - df['stopLoss'].to_numpy(dtype=np.float64))
+    reward = np.abs(df['target'].to_numpy(dtype=np.float64) - entry)
+    df['risk'] = risk
+    df['reward'] = reward
+    # A stop at the entry price gives inf (or NaN), as Series division did
+    with np.errstate(divide='ignore', invalid='ignore'):
+        df['rr_ratio'] = reward / risk
+    return _sort_by_date(df)
+
+def _sort_by_date(df: pd.DataFrame) -> pd.DataFrame:
+    """Order trades chronologically, skipping the sort when they already arrive in order"""
+    if not is_datetime64_any_dtype(df['date']):
+        # Mixed UTC offsets leave an object column of Timestamps, with no int64 view
+        return df.sort_values('date', kind='stable')
+    dates = df['date'].values.view('i8')
+    steps = np.diff(dates)
+    if np.all(steps >= 0):
+        return df
+    # Trade histories are often sent newest first
+    if np.all(steps < 0):
+        return df.iloc[::-1]
+    return df.iloc[np.argsort(dates, kind='stable')]
\ No newline at end of file
@@ -1,15 +1,70 @@
+import re
 from functools import wraps
+from typing import List, Dict, Any, Optional, get_type_hints
 from flask import request, jsonify
-from marshmallow import ValidationError
-from app.models.trade import TradeSchema
+import msgspec
+from marshmallow.utils import from_iso_datetime
+from app.models.trade import Trade
+
+FIELD_TYPES = get_type_hints(Trade)
+
+# Marshmallow's messages, so 400 bodies keep TradeSchema's wording
+TYPE_ERRORS = {int: 'Not a valid integer.', float: 'Not a valid number.', str: 'Not a valid string.'}
+INVALID_DATE = 'Not a valid datetime.'
+NON_FINITE = 'Special numeric values (nan or infinity) are not permitted.'
+
+_ERROR_PATH = re.compile(r'\$\[(\d+)\](?:\.(\w+))?')
+_NAMED_FIELD = re.compile(r'field `(\w+)`')
+# FiniteFloat's bounds, and values such as "1e309" that overflow a double
+_NON_FINITE_ERRORS = ('Expected `float` >=', 'Expected `float` <=', 'Number out of range')
+
+def _error_messages(message: str) -> Dict[Any, Any]:
+    """Turn a msgspec error ("... - at `$[0].size`") into TradeSchema's {index: {field: [message]}} shape"""
+    message, _, path = message.partition(' - at `')
+    match = _ERROR_PATH.match(path)
+    if match is None:
+        return {'_schema': ['Invalid input type.']}
+    index, field = int(match.group(1)), match.group(2)
+    
+    if field is None:
+        # Object-level errors name the missing or unknown field in the message
+        named = _NAMED_FIELD.search(message)
+        if named is None:
+            return {index: {'_schema': ['Invalid input type.']}}
+        field = named.group(1)
+        text = 'Unknown field.' if 'unknown field' in message else 'Missing data for required field.'
+    elif message.endswith('got `null`'):
+        text = 'Field may not be null.'
+    elif field == 'date':
+        text = INVALID_DATE
+    elif FIELD_TYPES.get(field) is float and message.startswith(_NON_FINITE_ERRORS):
+        text = NON_FINITE
+    else:
+        text = TYPE_ERRORS.get(FIELD_TYPES.get(field), message)
+    return {index: {field: [text]}}
+
+def trade_errors(data: Any) -> Optional[Dict[Any, Any]]:
+    """Errors for the first invalid trade in data, or None when every trade is valid"""
+    try:
+        # strict=False keeps Marshmallow's str -> number coercion
+        trades = msgspec.convert(data, List[Trade], strict=False)
+    except msgspec.ValidationError as err:
+        return _error_messages(str(err))
+    
+    # Only the date format is left to check in Python
+    for index, trade in enumerate(trades):
+        try:
+            from_iso_datetime(trade.date)
+        except ValueError:
+            return {index: {'date': [INVALID_DATE]}}
+    return None
 
 def validate_trades(f):
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        schema = TradeSchema(many=True)
-        try:
-            schema.load(request.json)
-        except ValidationError as err:
-            return jsonify(err.messages), 400
+        # get_json caches the parsed body, so the view's request.json does not decode it again
+        errors = trade_errors(request.get_json())
+        if errors:
+            return jsonify(errors), 400
         return f(*args, **kwargs)
     return decorated_function
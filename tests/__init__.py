@@ -0,0 +1,20 @@
+def make_trade(**overrides):
+    """A valid trade payload, with the given fields replaced"""
+    trade = {
+        'accountId': 1,
+        'pair': 'EURUSD',
+        'direction': 'long',
+        'status': 'win',
+        'strategy': 'none',
+        'date': '2024-01-01T10:00:00.000Z',
+        'accountBalance': 1000.0,
+        'entryPrice': 1.1,
+        'size': 0.1,
+        'stopLoss': 1.09,
+        'target': 1.12,
+        'exitPrice': 1.12,
+        'netPNL': 20.0,
+        'accountChange': 2.0
+    }
+    trade.update(overrides)
+    return trade
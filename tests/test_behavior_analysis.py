@@ -0,0 +1,118 @@
+import math
+import statistics
+import unittest
+from app.services.behavior_analyzer import BehaviorAnalyzer, _trade_scan
+from tests import make_trade
+
+# A loss followed by a win 10 minutes later, a loss followed by a win two hours later,
+# and a loss followed by another loss 20 minutes later
+TRADES = [
+    make_trade(date='2024-01-01T10:00:00Z', status='loss', netPNL=-10.0, accountBalance=1000.0, accountChange=-1.0),
+    make_trade(date='2024-01-01T10:10:00Z', status='win', netPNL=30.0, accountBalance=990.0, accountChange=3.0),
+    make_trade(date='2024-01-01T12:00:00Z', status='loss', netPNL=-20.0, accountBalance=1020.0, accountChange=-2.0),
+    make_trade(date='2024-01-01T14:00:00Z', status='win', netPNL=5.0, accountBalance=1000.0, accountChange=0.5),
+    make_trade(date='2024-01-01T14:20:00Z', status='loss', netPNL=-5.0, accountBalance=1005.0, accountChange=-0.5),
+    make_trade(date='2024-01-01T14:40:00Z', status='loss', netPNL=-15.0, accountBalance=1000.0, accountChange=-1.5),
+]
+
+class TestBehaviorAnalyzer(unittest.TestCase):
+
+    def setUp(self):
+        # Newest first, as trade histories usually arrive
+        self.analyzer = BehaviorAnalyzer(list(reversed(TRADES)))
+
+    def test_revenge_trading_looks_at_the_following_trade(self):
+        revenge = self.analyzer.detect_revenge_trading()
+        self.assertEqual(revenge['quick_trades_after_losses'], 2)
+        self.assertAlmostEqual(revenge['quick_trades_after_losses_success_rate'], 0.5)
+        self.assertAlmostEqual(revenge['avg_pnl_after_quick_trade'], (30.0 - 15.0) / 2)
+
+    def test_revenge_trading_without_quick_trades(self):
+        revenge = BehaviorAnalyzer(TRADES[2:4]).detect_revenge_trading()
+        self.assertEqual(revenge['quick_trades_after_losses'], 0)
+        self.assertTrue(math.isnan(revenge['quick_trades_after_losses_success_rate']))
+        self.assertTrue(math.isnan(revenge['avg_pnl_after_quick_trade']))
+
+    def test_loss_recovery_rate(self):
+        # Non-winning runs of 1, 1 and 2 trades
+        self.assertAlmostEqual(self.analyzer.calculate_loss_recovery_rate(), 4 / 3)
+        self.assertTrue(math.isnan(BehaviorAnalyzer([TRADES[1]]).calculate_loss_recovery_rate()))
+
+    def test_sharpe_ratio(self):
+        changes = [trade['accountChange'] for trade in TRADES]
+        expected = statistics.mean(changes) / statistics.stdev(changes) * math.sqrt(252)
+        self.assertAlmostEqual(self.analyzer.calculate_sharpe_ratio(), expected)
+        self.assertTrue(math.isnan(BehaviorAnalyzer([TRADES[0]]).calculate_sharpe_ratio()))
+
+    def test_max_drawdown(self):
+        # Peak of 1020 falls to 1000, relative to the 1000 starting balance
+        self.assertAlmostEqual(self.analyzer.calculate_max_drawdown(), 0.02)
+
+    def test_max_drawdown_from_zero_balance(self):
+        # An account funded after its first trade: inf with a drop, NaN without one
+        start = make_trade(date='2024-01-01T09:00:00Z', status='breakeven', netPNL=0.0, accountBalance=0.0, accountChange=0.0)
+        analyzer = BehaviorAnalyzer([start] + TRADES)
+        self.assertEqual(analyzer.calculate_max_drawdown(), math.inf)
+        self.assertEqual(analyzer.determine_risk_level(), 'High')
+        self.assertIn('Over 7 trades', analyzer.get_key_insights())
+        self.assertTrue(math.isnan(BehaviorAnalyzer([start, start]).calculate_max_drawdown()))
+
+    def test_compiled_scan_matches_python(self):
+        # Without numba the kernel runs as plain Python and must agree
+        python_scan = getattr(_trade_scan, 'py_func', _trade_scan)
+        for trades in (TRADES, [make_trade(date='2024-01-01T09:00:00Z', status='loss', netPNL=-5.0, accountBalance=0.0, accountChange=0.0)] + TRADES):
+            analyzer = BehaviorAnalyzer(trades)
+            args = (
+                analyzer.trades_df['date'].values.view('i8'), analyzer._is_win, analyzer._is_loss,
+                analyzer._pnl, analyzer._bal, analyzer.trades_df['accountChange'].to_numpy(dtype=float)
+            )
+            for compiled, python in zip(_trade_scan(*args), python_scan(*args)):
+                if math.isnan(compiled):
+                    self.assertTrue(math.isnan(python))
+                else:
+                    self.assertAlmostEqual(compiled, python)
+
+    def test_overtrading_buckets_by_local_day(self):
+        # Three of the four 2 January (+05:30) trades fall on 1 January in UTC
+        dates = [
+            '2024-01-01T22:00:00+05:30',
+            '2024-01-02T01:00:00+05:30',
+            '2024-01-02T04:00:00+05:30',
+            '2024-01-02T06:00:00+05:30',
+            '2024-01-02T07:00:00+05:30',
+            '2024-01-03T12:00:00+05:30',
+            '2024-01-04T12:00:00+05:30',
+        ]
+        overtrading = BehaviorAnalyzer([make_trade(date=date) for date in dates]).detect_overtrading()
+        # 1, 4, 1 and 1 trades a day: mean 1.75, sample std 1.5
+        self.assertAlmostEqual(overtrading['avg_trades_per_day'], 1.75)
+        self.assertEqual(overtrading['max_trades_per_day'], 4)
+        self.assertEqual(overtrading['days_with_excessive_trading'], 1)
+        self.assertEqual(overtrading['trading_frequency_distribution'], {1: 3, 4: 1})
+
+    def test_overtrading_on_a_single_day(self):
+        # One day has no sample std, so no day counts as excessive
+        overtrading = self.analyzer.detect_overtrading()
+        self.assertAlmostEqual(overtrading['avg_trades_per_day'], 6.0)
+        self.assertEqual(overtrading['max_trades_per_day'], 6)
+        self.assertEqual(overtrading['days_with_excessive_trading'], 0)
+        self.assertEqual(overtrading['trading_frequency_distribution'], {6: 1})
+
+    def test_mixed_utc_offsets(self):
+        # A loss at 00:50Z and a loss 20 minutes later, written in different offsets
+        trades = [
+            make_trade(date='2024-03-31T01:50:00+01:00', status='loss', netPNL=-5.0),
+            make_trade(date='2024-03-31T03:10:00+02:00', status='loss', netPNL=-10.0),
+        ]
+        analyzer = BehaviorAnalyzer(trades)
+        self.assertEqual(analyzer.detect_revenge_trading()['quick_trades_after_losses'], 1)
+        self.assertEqual(analyzer.detect_overtrading()['max_trades_per_day'], 2)
+
+    def test_key_insights(self):
+        insight = self.analyzer.get_key_insights()
+        self.assertIn('Over 6 trades', insight)
+        self.assertIn('33.33% win rate', insight)
+        self.assertIn('total PNL of -15.00', insight)
+
+if __name__ == '__main__':
+    unittest.main()
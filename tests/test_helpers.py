@@ -0,0 +1,30 @@
+import unittest
+from app.utils.helpers import calculate_trade_metrics
+from tests import make_trade
+
+def sorted_ids(dates):
+    # Tag each trade with its input position, then read back the sorted order
+    trades = [make_trade(date=date, accountId=i) for i, date in enumerate(dates)]
+    return list(calculate_trade_metrics(trades)['accountId'])
+
+class TestSortByDate(unittest.TestCase):
+
+    def test_ascending_dates_keep_their_order(self):
+        dates = ['2024-01-01T10:00:00Z', '2024-01-01T11:00:00Z', '2024-01-02T09:00:00Z']
+        self.assertEqual(sorted_ids(dates), [0, 1, 2])
+
+    def test_descending_dates_are_reversed(self):
+        dates = ['2024-01-02T09:00:00Z', '2024-01-01T11:00:00Z', '2024-01-01T10:00:00Z']
+        self.assertEqual(sorted_ids(dates), [2, 1, 0])
+
+    def test_tied_dates_keep_their_input_order(self):
+        dates = ['2024-01-01T11:00:00Z', '2024-01-01T10:00:00Z', '2024-01-01T11:00:00Z', '2024-01-01T10:00:00Z']
+        self.assertEqual(sorted_ids(dates), [1, 3, 0, 2])
+
+    def test_mixed_utc_offsets_sort_by_instant(self):
+        # Either side of a DST change: 08:00Z, 09:00Z the day before, then 08:30Z
+        dates = ['2024-03-31T10:00:00+02:00', '2024-03-30T10:00:00+01:00', '2024-03-31T09:30:00+01:00']
+        self.assertEqual(sorted_ids(dates), [1, 0, 2])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,183 @@
+import json
+import math
+import os
+import unittest
+import pandas as pd
+from app.services.pattern_analyzer import PatternAnalyzer, SIZE_LABELS
+from app.utils.helpers import calculate_trade_metrics
+from tests import make_trade
+
+SAMPLE_TRADES = os.path.join(os.path.dirname(__file__), 'test_data', 'sample_trades.json')
+
+def make_trades(sizes=None, rr_ratios=None):
+    n = len(sizes if sizes is not None else rr_ratios)
+    return [
+        make_trade(
+            date=f'2024-01-01T10:{i:02d}:00Z',
+            size=sizes[i] if sizes is not None else 0.1,
+            # One unit of risk, so the target sets the risk/reward ratio
+            entryPrice=100.0,
+            stopLoss=99.0,
+            target=100.0 + (rr_ratios[i] if rr_ratios is not None else 2.0),
+            status='win' if i % 3 == 0 else 'loss',
+            netPNL=float(i * 7 % 11 - 5),
+            accountChange=float(i % 4) / 2
+        )
+        for i in range(n)
+    ]
+
+def qcut_size_impact(trades):
+    """Position size groups computed with pd.qcut and groupby"""
+    df = calculate_trade_metrics(trades)
+    df['size_quartile'] = pd.qcut(df['size'], min(len(df), 4), labels=False, duplicates='drop')
+    analysis = df.groupby('size_quartile').agg({
+        'status': lambda x: (x == 'win').mean(),
+        'netPNL': ['mean', 'std'],
+        'accountChange': ['mean', 'std']
+    }).round(4)
+    return {
+        SIZE_LABELS[int(group)]: {
+            'win_rate': float(analysis.loc[group, ('status', '<lambda>')]),
+            'netPNL': {
+                'mean': float(analysis.loc[group, ('netPNL', 'mean')]),
+                'std': float(analysis.loc[group, ('netPNL', 'std')])
+            },
+            'accountChange': {
+                'mean': float(analysis.loc[group, ('accountChange', 'mean')]),
+                'std': float(analysis.loc[group, ('accountChange', 'std')])
+            }
+        }
+        for group in analysis.index
+    }
+
+def qcut_risk_reward(trades):
+    """Risk/reward ranges computed with pd.qcut and groupby"""
+    df = calculate_trade_metrics(trades)
+    rr_groups = pd.qcut(df['rr_ratio'], min(len(df), 4), duplicates='drop')
+    analysis = df.groupby(rr_groups, observed=False).agg({
+        'status': lambda x: (x == 'win').mean(),
+        'netPNL': 'mean'
+    }).round(4)
+    return {
+        f"{rr_range.left:.2f}-{rr_range.right:.2f}": {
+            'win_rate': float(row['status']),
+            'avg_netPNL': float(row['netPNL'])
+        }
+        for rr_range, row in analysis.iterrows()
+    }
+
+def groupby_direction_bias(trades):
+    """Pair/direction stats computed with groupby"""
+    df = calculate_trade_metrics(trades)
+    analysis = df.groupby(['pair', 'direction']).agg({
+        'status': lambda x: (x == 'win').mean(),
+        'netPNL': 'mean',
+        'accountChange': 'mean'
+    }).round(4)
+    result = {}
+    for (pair, direction), row in analysis.iterrows():
+        result.setdefault(pair, {})[direction] = {
+            'win_rate': float(row['status']),
+            'avg_netPNL': float(row['netPNL']),
+            'avg_accountChange': float(row['accountChange'])
+        }
+    return result
+
+def nan_to_str(value):
+    # NaN never compares equal, so compare its name instead
+    if isinstance(value, dict):
+        return {key: nan_to_str(item) for key, item in value.items()}
+    if isinstance(value, float) and math.isnan(value):
+        return 'nan'
+    return value
+
+class TestPatternAnalyzer(unittest.TestCase):
+
+    def assertMatchesQcut(self, trades):
+        analyzer = PatternAnalyzer(trades)
+        expected_size = qcut_size_impact(trades)
+        expected_rr = qcut_risk_reward(trades)
+        self.assertEqual(list(analyzer.analyze_position_size_impact()), list(expected_size))
+        self.assertEqual(nan_to_str(analyzer.analyze_position_size_impact()), nan_to_str(expected_size))
+        self.assertEqual(list(analyzer.analyze_risk_reward_patterns()), list(expected_rr))
+        self.assertEqual(nan_to_str(analyzer.analyze_risk_reward_patterns()), nan_to_str(expected_rr))
+
+    def assertMatchesGroupby(self, trades):
+        bias = PatternAnalyzer(trades).analyze_pair_direction_bias()
+        expected = groupby_direction_bias(trades)
+        # Pairs and their directions come out in groupby's sorted order
+        self.assertEqual([(pair, list(bias[pair])) for pair in bias], [(pair, list(expected[pair])) for pair in expected])
+        self.assertEqual(bias, expected)
+
+    def test_sample_trades_direction_bias_matches_groupby(self):
+        with open(SAMPLE_TRADES, 'r') as f:
+            self.assertMatchesGroupby(json.load(f))
+
+    def test_direction_bias_matches_groupby(self):
+        # XAUUSD is only traded short and GBPJPY only long
+        pairs = [
+            ('XAUUSD', 'short'), ('EURUSD', 'short'), ('GBPJPY', 'long'), ('EURUSD', 'long'),
+            ('XAUUSD', 'short'), ('EURUSD', 'long'), ('GBPJPY', 'long'), ('EURUSD', 'short'),
+            ('EURUSD', 'long')
+        ]
+        trades = make_trades(sizes=[0.1] * len(pairs))
+        for trade, (pair, direction) in zip(trades, pairs):
+            trade['pair'] = pair
+            trade['direction'] = direction
+            trade['accountChange'] = trade['netPNL'] / 3
+        self.assertMatchesGroupby(trades)
+
+    def test_sample_trades_match_qcut(self):
+        with open(SAMPLE_TRADES, 'r') as f:
+            self.assertMatchesQcut(json.load(f))
+
+    def test_quartiles_match_qcut(self):
+        self.assertMatchesQcut(make_trades(
+            sizes=[0.01, 0.5, 0.2, 1.0, 0.1, 0.3, 0.05, 2.0],
+            rr_ratios=[1.5, 0.5, 3.0, 2.25, 1.0, 4.0, 2.0, 0.75]
+        ))
+
+    def test_tied_values_match_qcut(self):
+        # Repeated quantile edges are dropped, leaving fewer groups
+        self.assertMatchesQcut(make_trades(
+            sizes=[0.1, 0.1, 0.1, 0.1, 0.1, 0.5, 1.0],
+            rr_ratios=[2.0, 2.0, 2.0, 2.0, 3.0, 3.0, 1.0]
+        ))
+
+    def test_missing_ratios_match_qcut(self):
+        # Stop loss, entry and target at one price leave no ratio; those trades still count towards the groups
+        for rr_ratios in ([0.0, 2.0, 3.0], [0.0, 0.0, 3.0, 4.0, 5.0]):
+            trades = make_trades(sizes=[0.1 * (i + 1) for i in range(len(rr_ratios))], rr_ratios=rr_ratios)
+            for trade, rr_ratio in zip(trades, rr_ratios):
+                if rr_ratio == 0.0:
+                    trade['stopLoss'] = trade['entryPrice']
+            self.assertMatchesQcut(trades)
+
+    def test_single_trade_matches_qcut(self):
+        self.assertMatchesQcut(make_trades(sizes=[0.1]))
+
+    def test_equal_values_share_one_group(self):
+        # pd.qcut leaves every trade out here; they are kept together as it does for a single trade
+        trades = make_trades(sizes=[0.1] * 5)
+        analyzer = PatternAnalyzer(trades)
+
+        size_impact = analyzer.analyze_position_size_impact()
+        self.assertEqual(list(size_impact), ['Small'])
+        self.assertEqual(size_impact['Small']['win_rate'], 0.4)
+
+        rr_patterns = analyzer.analyze_risk_reward_patterns()
+        self.assertEqual(list(rr_patterns), ['2.00-2.00'])
+        self.assertEqual(rr_patterns['2.00-2.00']['avg_netPNL'], sum(t['netPNL'] for t in trades) / 5)
+
+    def test_stop_at_entry_falls_in_top_range(self):
+        # pd.qcut rejects an infinite ratio outright; it goes in an open-ended top range
+        trades = make_trades(rr_ratios=[1.0, 2.0, 3.0, 4.0, 5.0])
+        trades[4]['stopLoss'] = trades[4]['entryPrice']
+        rr_patterns = PatternAnalyzer(trades).analyze_risk_reward_patterns()
+
+        self.assertEqual(list(rr_patterns), ['1.00-2.00', '2.00-3.00', '3.00-4.00', '4.00-inf'])
+        self.assertEqual(rr_patterns['1.00-2.00']['avg_netPNL'], (trades[0]['netPNL'] + trades[1]['netPNL']) / 2)
+        self.assertEqual(rr_patterns['4.00-inf'], {'win_rate': 0.0, 'avg_netPNL': trades[4]['netPNL']})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+from app.utils.validators import trade_errors, NON_FINITE, INVALID_DATE
+from tests import make_trade
+
+class TestValidateTrades(unittest.TestCase):
+
+    def test_valid_trades(self):
+        self.assertIsNone(trade_errors([make_trade(), make_trade(status='loss')]))
+
+    def test_numeric_strings_are_coerced(self):
+        self.assertIsNone(trade_errors([make_trade(size='0.5', accountId='7')]))
+
+    def test_iso_dates_without_seconds_are_accepted(self):
+        self.assertIsNone(trade_errors([make_trade(date='2024-01-01T10:00')]))
+        self.assertIsNone(trade_errors([make_trade(date='2024-01-01 10:00:00')]))
+
+    def test_numeric_date_is_rejected(self):
+        self.assertEqual(trade_errors([make_trade(date=1704103200)]), {0: {'date': [INVALID_DATE]}})
+
+    def test_malformed_date_is_rejected(self):
+        self.assertEqual(trade_errors([make_trade(date='2024-13-01T10:00')]), {0: {'date': [INVALID_DATE]}})
+        self.assertEqual(trade_errors([make_trade(date='2024-01-01')]), {0: {'date': [INVALID_DATE]}})
+
+    def test_non_finite_floats_are_rejected(self):
+        self.assertEqual(trade_errors([make_trade(), make_trade(size='nan')]), {1: {'size': [NON_FINITE]}})
+        self.assertEqual(trade_errors([make_trade(netPNL='inf')]), {0: {'netPNL': [NON_FINITE]}})
+        self.assertEqual(trade_errors([make_trade(target='-inf')]), {0: {'target': [NON_FINITE]}})
+        self.assertEqual(trade_errors([make_trade(stopLoss=float('nan'))]), {0: {'stopLoss': [NON_FINITE]}})
+        # Overflows to infinity, as float('1e309') does
+        self.assertEqual(trade_errors([make_trade(exitPrice='1e309')]), {0: {'exitPrice': [NON_FINITE]}})
+
+    def test_errors_are_keyed_by_index_and_field(self):
+        self.assertEqual(trade_errors([make_trade(size='abc')]), {0: {'size': ['Not a valid number.']}})
+        self.assertEqual(trade_errors([make_trade(entryPrice=None)]), {0: {'entryPrice': ['Field may not be null.']}})
+        self.assertEqual(trade_errors([make_trade(extra=1)]), {0: {'extra': ['Unknown field.']}})
+
+        missing = make_trade()
+        del missing['netPNL']
+        self.assertEqual(trade_errors([missing]), {0: {'netPNL': ['Missing data for required field.']}})
+
+    def test_non_list_payload_is_rejected(self):
+        self.assertEqual(trade_errors({'pair': 'EURUSD'}), {'_schema': ['Invalid input type.']})
+
+if __name__ == '__main__':
+    unittest.main()